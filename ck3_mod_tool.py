@@ -1,5 +1,5 @@
 import sys
-from python_resources.index import main as process_mods
+from python_resources.index import main as process_mods, diff_main as diff_mods, serve_main as serve_library
 from python_resources.config import setup_config
 
 def show_menu():
@@ -22,6 +22,17 @@ def show_help():
     print("4. Exit - Quit the program")
     print("\nYou can also run specific functions directly:")
     print("- 'process' to process mods")
+    print("    --name GLOB          only mods whose name matches the glob")
+    print("    --id REMOTE_FILE_ID  only mods with this remote_file_id")
+    print("    --tag TAG            only mods with this tag")
+    print("    --compatible         only mods whose supported_version matches the current game version")
+    print("                         (wildcards allowed, e.g. 1.11.* matches 1.11.0)")
+    print("    --playset FILE       only enabled mods of an exported launcher playset")
+    print("    --resume             resume an interrupted run, skipping completed work")
+    print("- 'diff MOD' to compare a Workshop mod (name or remote_file_id) with its processed copy")
+    print("- 'diff DIR DIR' to compare two mod directories, e.g. two backups")
+    print("- 'serve' to answer library queries as JSON on http://127.0.0.1:8765")
+    print("    --host HOST --port PORT --refresh SECONDS")
     print("- 'config' to configure paths")
     print("- 'help' to show help")
 
@@ -30,7 +41,11 @@ def main():
         # Handle direct commands
         command = sys.argv[1].lower()
         if command == 'process':
-            process_mods()
+            process_mods(sys.argv[2:])
+        elif command == 'diff':
+            diff_mods(sys.argv[2:])
+        elif command == 'serve':
+            serve_library(sys.argv[2:])
         elif command == 'config':
             setup_config()
         elif command == 'help':
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import os
 import sys
@@ -19,34 +20,80 @@ from utils.logger import logger
 from utils.mod_validator import ModValidator
 from utils.file_operations import FileOperations
 from utils.mod_report import ModReport
+from utils.mod_filter import ModFilter
+from utils.run_journal import RunJournal
+from utils.mod_diff import ModDiff
+from utils.library_index import LibraryIndex
+from utils.library_server import LibraryServer
+from utils.library_catalog import LibraryCatalog
 
 
 class ModProcessor:
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], mod_filter: Optional[ModFilter] = None):
         self.GAME_VERSION = "1.11.0"  # Current CK3 version
         self.config = config
         self.output_path = Path(os.getcwd()) / config["output_path"]
         self.mod_report = ModReport(self.output_path)
+        self.mod_filter = mod_filter
+        # Tool state lives in a dot-directory that cleanup skips and that keeps
+        # catalog writes from touching the output directory's mtime
+        self.state_path = self.output_path / '.ck3-workshop'
+        self.journal = RunJournal(str(self.state_path))
+        self.catalog = LibraryCatalog(str(self.state_path))
 
     def initialize(self) -> None:
         logger.init()
-        # Create output directory for processed mods
-        os.makedirs(self.output_path, exist_ok=True)
+        # Create output directory for processed mods, with the state directory
+        # up front so later catalog writes never change the output mtime
+        os.makedirs(self.state_path, exist_ok=True)
         # Create directory for local mods if it doesn't exist
         os.makedirs(self.config["local_mods_path"], exist_ok=True)
         logger.info('ModProcessor initialized successfully')
         logger.info(f"Using output directory: {self.output_path}")
         logger.info(f"Using local mods directory: {self.config['local_mods_path']}")
+        if self.mod_filter and self.mod_filter.is_active():
+            logger.info(f"Using mod filters: {self.mod_filter.describe()}")
+
+    def get_dest_path(self, metadata: Dict[str, Any], is_local: bool) -> Path:
+        """Get the output directory a processed mod is copied to"""
+        version_string = ModValidator.get_version_string(metadata)
+        dest_name = f"{metadata['name']} {version_string}{' [LOCAL]' if is_local else ''}"
+        return self.output_path / self.safe_name(dest_name)
+
+    @staticmethod
+    def safe_name(name: str) -> str:
+        """Replace the characters that are not allowed in directory names"""
+        return "".join(c if c not in "\\/:*?\"<>|" else "_" for c in name)
+
+    def find_processed_copy(self, metadata: Dict[str, Any], is_local: bool) -> Path:
+        """Get the processed copy of a mod, or the newest copy of another version of it.
+
+        The version is part of the directory name, so after a Workshop update
+        the copy made before it is found by the mod name instead.
+        """
+        dest_path = self.get_dest_path(metadata, is_local)
+        if dest_path.is_dir() or not self.output_path.is_dir():
+            return dest_path
+
+        prefix = self.safe_name(f"{metadata['name']} [")
+        copies = [
+            entry for entry in self.output_path.iterdir()
+            if entry.is_dir() and entry.name.startswith(prefix) and entry.name.endswith(' [LOCAL]') == is_local
+        ]
+        return max(copies, key=lambda entry: entry.stat().st_mtime, default=dest_path)
 
     def process_single_mod_file(self, mod_file_path: str, source_path: str, is_local: bool) -> bool:
         try:
-            mod_folder_path = Path(source_path) / mod_file_path
-            metadata = ModValidator.validate_mod(mod_file_path, str(mod_folder_path))
-
+            metadata = self.read_mod_metadata(source_path, mod_file_path)
             if not metadata:
                 logger.warn(f"Failed to validate mod: {mod_file_path}")
                 return False
 
+            mod_folder_path = ModValidator.resolve_mod_folder(str(Path(source_path) / mod_file_path), metadata)
+            if not asyncio.run(ModValidator.validate_mod_folder(mod_folder_path)):
+                logger.warn(f"Failed to validate mod: {mod_file_path}")
+                return False
+
             # Check for missing version information
             mod_issue = {
                 "mod_name": metadata["name"],
@@ -56,28 +103,27 @@ class ModProcessor:
             }
 
             # Validate game version compatibility
-            is_game_version_compatible = ModValidator.check_game_version(metadata, self.GAME_VERSION)
+            is_game_version_compatible = asyncio.run(ModValidator.check_game_version(metadata, self.GAME_VERSION))
             if not is_game_version_compatible:
                 logger.warn(f"Mod {metadata['name']} may not be compatible with game version {self.GAME_VERSION}")
 
-            # Check dependencies
-            if metadata.get("dependencies"):
-                for dep in metadata["dependencies"]:
-                    if not ModValidator.validate_dependencies(metadata, dep):
-                        mod_issue["missing_dependencies"].append(dep)
+            # Check dependencies against every mod in the library
+            for dep in self.catalog.missing_dependencies(metadata):
+                logger.warn(f"Missing dependency for {metadata['name']}: {dep}")
+                mod_issue["missing_dependencies"].append(dep)
 
             # Add to report if there are any issues
             if mod_issue["missing_version"] or mod_issue["missing_game_version"] or mod_issue["missing_dependencies"]:
                 self.mod_report.add_issue(mod_issue)
 
             version_string = ModValidator.get_version_string(metadata)
-            dest_name = f"{metadata['name']} {version_string}{' [LOCAL]' if is_local else ''}"
-            safe_name = "".join(c if c not in "\\/:*?\"<>|" else "_" for c in dest_name)
-            dest_path = self.output_path / safe_name
+            dest_path = self.get_dest_path(metadata, is_local)
+            safe_name = dest_path.name
 
             logger.info(f"Processing {'local' if is_local else 'workshop'} mod: {metadata['name']} ({version_string})")
 
-            # Check if mod already exists
+            # Check if mod already exists. Mods only appear at their final
+            # destination once fully copied, so an existing directory is complete.
             if dest_path.exists():
                 logger.info(f"Mod already exists: {safe_name}")
                 return True
@@ -90,14 +136,23 @@ class ModProcessor:
             except FileNotFoundError:
                 pass
 
-            # Copy mod files with verification
-            success = FileOperations.copy_dir_concurrent(
-                str(mod_folder_path),
-                str(dest_path),
-                True  # enable hash verification
+            # Copy mod files with verification into a staging directory
+            staging_path = self.journal.staging_path(safe_name)
+            done_files = self.journal.done_files(safe_name)
+            if done_files:
+                logger.info(f"Resuming {safe_name}: {len(done_files)} files already copied")
+            self.journal.mod_started(safe_name, mod_folder_path)
+            success = FileOperations.copy_dir_staged(
+                mod_folder_path,
+                staging_path,
+                done_files,
+                lambda file: self.journal.file_done(safe_name, file)
             )
 
             if success:
+                # Move the completed copy into place in a single rename
+                os.replace(staging_path, dest_path)
+                self.journal.mod_done(safe_name)
                 logger.info(f"Successfully processed mod: {safe_name}")
                 return True
             else:
@@ -107,10 +162,68 @@ class ModProcessor:
             logger.error(f"Error processing mod: {mod_file_path}", error)
             return False
 
+    def read_mod_metadata(self, directory: str, mod_file: str) -> Optional[Dict[str, Any]]:
+        """Read the metadata of a .mod file without validating its folder"""
+        metadata = self.catalog.get_metadata(os.path.join(directory, mod_file))
+        if metadata:
+            return metadata
+
+        try:
+            with open(os.path.join(directory, mod_file), 'r', encoding='utf-8') as f:
+                content = f.read()
+            return asyncio.run(ModValidator.extract_metadata(content))
+        except Exception as error:
+            logger.error(f"Error reading mod file: {mod_file}", error)
+            return None
+
+    def refresh_catalog(self) -> List[str]:
+        """Bring the catalog of the Workshop and local mod directories up to date"""
+        directories = []
+        for directory, is_local in (
+            (self.config["workshop_path"], False),
+            (self.config["local_mods_path"], True)
+        ):
+            self.catalog.refresh_directory(directory, is_local)
+            directories.append(os.path.abspath(directory))
+        return directories
+
+    def find_mod(self, query: str) -> Optional[Tuple[Optional[Path], Path]]:
+        """Find a mod by name or remote_file_id, returning its content folder and processed path"""
+        directories = self.refresh_catalog()
+
+        for mod in self.catalog.find_mods(query):
+            if mod["directory"] in directories and mod["metadata"]:
+                mod_folder = ModValidator.resolve_mod_folder(mod["mod_file"], mod["metadata"])
+                return (
+                    Path(mod_folder) if mod_folder else None,
+                    self.find_processed_copy(mod["metadata"], mod["is_local"])
+                )
+        return None
+
+    def discover_mod_files(self, directory: str, is_local: bool) -> List[str]:
+        """List the .mod files in a directory that pass the active filters"""
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Mod directory not found: {directory}")
+
+        # Only re-reads .mod files that changed since the catalog last saw them
+        self.catalog.refresh_directory(directory, is_local)
+        mods = self.catalog.list_mods(directory)
+        mod_files = [mod["file_name"] for mod in mods]
+
+        if not self.mod_filter or not self.mod_filter.is_active():
+            return mod_files
+
+        selected = []
+        for mod in mods:
+            if mod["metadata"] and self.mod_filter.matches(mod["metadata"], self.GAME_VERSION):
+                selected.append(mod["file_name"])
+
+        logger.info(f"Selected {len(selected)}/{len(mod_files)} mods in {directory}")
+        return selected
+
     def process_mods_in_directory(self, directory: str, is_local: bool) -> Tuple[int, int]:
-        files = os.listdir(directory)
-        mod_files = [file for file in files if file.endswith('.mod')]
-        
+        mod_files = self.discover_mod_files(directory, is_local)
+
         processed = 0
         successful = 0
 
@@ -124,9 +237,12 @@ class ModProcessor:
         print()  # New line after progress display
         return processed, successful
 
-    def process_all_mods(self) -> None:
+    def process_all_mods(self, resume: bool = False) -> None:
         try:
             logger.info('Starting mod processing...')
+            self.journal.start(resume)
+            # Dependencies may be in either directory, so catalogue both before processing
+            self.refresh_catalog()
 
             # Process Workshop mods
             workshop_processed, workshop_successful = self.process_mods_in_directory(
@@ -149,22 +265,117 @@ class ModProcessor:
             FileOperations.cleanup(str(self.output_path), 30)  # Keep backups for 30 days
             logger.cleanup(7)  # Keep logs for 7 days
 
+            self.journal.finish()
             logger.info('Completed processing all mods')
         except Exception as error:
             logger.error('Error processing mods', error)
+            logger.info('Run journal kept, use --resume to continue')
+            self.journal.close()
             sys.exit(1)
 
 
-def main():
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ck3_mod_tool.py process', description='Process CK3 mods')
+    parser.add_argument('--name', action='append', metavar='GLOB', help='Only process mods whose name matches the glob')
+    parser.add_argument('--id', action='append', metavar='REMOTE_FILE_ID', help='Only process mods with this remote_file_id')
+    parser.add_argument('--tag', action='append', help='Only process mods with this tag')
+    parser.add_argument('--compatible', action='store_true', help='Only process mods whose supported_version matches the current game version ("1.11.*" matches 1.11.0)')
+    parser.add_argument('--playset', metavar='FILE', help='Only process enabled mods of an exported launcher playset')
+    parser.add_argument('--resume', action='store_true', help='Resume an interrupted run, skipping completed work')
+    return parser
+
+
+def build_diff_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='ck3_mod_tool.py diff',
+        description='Compare a Workshop mod with its processed copy, or two mod directories'
+    )
+    parser.add_argument('mod', help='Mod name or remote_file_id, or the first directory to compare')
+    parser.add_argument('other', nargs='?', help='Second directory to compare (e.g. a backup)')
+    return parser
+
+
+def diff_main(argv: Optional[List[str]] = None):
+    args = build_diff_arg_parser().parse_args(argv or [])
+
+    try:
+        processor = None
+        if args.other:
+            # Comparing arbitrary directories, such as backups, leaves no state behind
+            path_a, path_b = Path(args.mod), Path(args.other)
+        else:
+            # Keep catalog logging in the log file so it does not mix with the report
+            logger.init(console=False)
+            processor = ModProcessor(load_config())
+            found = processor.find_mod(args.mod)
+            if not found:
+                print(f"Mod not found: {args.mod}")
+                sys.exit(1)
+            # Show what syncing would change in the processed copy
+            source_path, dest_path = found
+            if source_path is None:
+                print(f"Mod folder not found for: {args.mod}")
+                sys.exit(1)
+            path_a, path_b = dest_path, source_path
+
+        for path in (path_a, path_b):
+            if not path.is_dir():
+                print(f"Not a mod directory: {path}")
+                sys.exit(1)
+
+        if processor:
+            # Catalogue both folders while listing them so their hashes are kept for the next diff
+            diff = ModDiff.compare(
+                str(path_a), str(path_b), processor.catalog.file_hash, processor.catalog.get_manifest
+            )
+        else:
+            diff = ModDiff.compare(str(path_a), str(path_b))
+        print(ModDiff.format_report(diff, str(path_a), str(path_b)))
+    except Exception as error:
+        print(f"Fatal error: {error}")
+        sys.exit(1)
+
+
+def build_serve_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='ck3_mod_tool.py serve', description='Serve the mod library index as JSON')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
+    parser.add_argument('--refresh', type=float, default=10, metavar='SECONDS', help='How often to check for library changes')
+    return parser
+
+
+def serve_main(argv: Optional[List[str]] = None):
+    args = build_serve_arg_parser().parse_args(argv or [])
+
     try:
         config = load_config()
-        
+
         if not config.get("workshop_path"):
             config = setup_config()
 
         processor = ModProcessor(config)
         processor.initialize()
-        processor.process_all_mods()
+        server = LibraryServer(LibraryIndex(processor), args.host, args.port, args.refresh)
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        logger.info('Stopped serving library index')
+    except Exception as error:
+        print(f"Fatal error: {error}")
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = build_arg_parser().parse_args(argv or [])
+
+    try:
+        config = load_config()
+        
+        if not config.get("workshop_path"):
+            config = setup_config()
+
+        processor = ModProcessor(config, ModFilter.from_args(args))
+        processor.initialize()
+        processor.process_all_mods(args.resume)
     except Exception as error:
         print(f"Fatal error: {error}")
         sys.exit(1)
@@ -3,7 +3,7 @@ import shutil
 import hashlib
 import concurrent.futures
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Set
 from datetime import datetime, timedelta
 
 # Assuming logger is imported from another module
@@ -91,6 +91,74 @@ class FileOperations:
             logger.error(f"Error copying directory {src} to {dest}", error)
             return False
 
+    @staticmethod
+    def copy_dir_staged(
+        src: str,
+        dest: str,
+        done_files: Optional[Set[str]] = None,
+        on_file_done: Optional[Callable[[str], None]] = None
+    ) -> bool:
+        """Copy a directory tree with hash verification, reporting each verified file.
+
+        Files listed in done_files are skipped when the copy at dest still
+        matches the source size and mtime. Timestamps are preserved so later
+        runs can make that comparison.
+        """
+        # os.walk yields nothing for a missing source, which would look like a successful empty copy
+        if not os.path.isdir(src):
+            logger.error(f"Source is not a directory: {src}")
+            return False
+
+        try:
+            FileOperations.ensure_dir(dest)
+            done_files = done_files or set()
+            futures = {}
+
+            # Threads rather than the process pool so progress is reported in this process
+            with concurrent.futures.ThreadPoolExecutor(max_workers=FileOperations.MAX_WORKERS) as executor:
+                for root, _, files in os.walk(src):
+                    for file in files:
+                        src_path = os.path.join(root, file)
+                        rel_path = os.path.relpath(src_path, src).replace(os.sep, '/')
+                        dest_path = os.path.join(dest, rel_path)
+
+                        if rel_path in done_files and FileOperations.same_stat(src_path, dest_path):
+                            continue
+
+                        future = executor.submit(FileOperations._copy_preserving_stat, src_path, dest_path)
+                        futures[future] = rel_path
+
+                success = True
+                for future in concurrent.futures.as_completed(futures):
+                    if future.result():
+                        if on_file_done:
+                            on_file_done(futures[future])
+                    else:
+                        success = False
+
+            return success
+        except Exception as error:
+            logger.error(f"Error copying directory {src} to {dest}", error)
+            return False
+
+    @staticmethod
+    def _copy_preserving_stat(src: str, dest: str) -> bool:
+        """Copy a file with verification and keep its timestamps"""
+        if not FileOperations.copy_with_verification(src, dest):
+            return False
+        shutil.copystat(src, dest)
+        return True
+
+    @staticmethod
+    def same_stat(path_a: str, path_b: str) -> bool:
+        """Check if two files have the same size and modification time"""
+        try:
+            stat_a = os.stat(path_a)
+            stat_b = os.stat(path_b)
+        except OSError:
+            return False
+        return stat_a.st_size == stat_b.st_size and int(stat_a.st_mtime) == int(stat_b.st_mtime)
+
     @staticmethod
     def _copy_file(src: str, dest: str) -> bool:
         """Simple file copy without verification"""
@@ -115,12 +183,15 @@ class FileOperations:
 
     @staticmethod
     def cleanup(directory: str, older_than_days: int) -> None:
-        """Remove files and directories older than the specified days"""
+        """Remove files and directories older than the specified days, except hidden ones"""
         try:
             now = datetime.now()
             max_age = timedelta(days=older_than_days)
             
             for entry in os.scandir(directory):
+                # Dot entries hold tool state such as the catalog and run journal
+                if entry.name.startswith('.'):
+                    continue
                 try:
                     mtime = datetime.fromtimestamp(entry.stat().st_mtime)
                     if now - mtime > max_age:
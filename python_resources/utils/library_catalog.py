@@ -0,0 +1,401 @@
+import os
+import json
+import sqlite3
+import asyncio
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Any
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+from utils.mod_validator import ModMetadata, ModValidator
+from utils.file_operations import FileOperations
+from utils.mod_diff import ModDiff
+
+
+class LibraryCatalog:
+    """Persistent SQLite catalog of mod metadata, file manifests, hashes and issues"""
+    CATALOG_NAME = 'catalog.sqlite'
+    SCHEMA_VERSION = 1
+
+    SCHEMA = [
+        '''CREATE TABLE IF NOT EXISTS directories (
+            path TEXT PRIMARY KEY,
+            is_local INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            scanned_at TEXT NOT NULL
+        )''',
+        '''CREATE TABLE IF NOT EXISTS mods (
+            mod_file TEXT PRIMARY KEY,
+            directory TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            is_local INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            workshop_id TEXT,
+            name TEXT,
+            metadata TEXT,
+            scanned_at TEXT NOT NULL
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_mods_directory ON mods (directory)',
+        'CREATE INDEX IF NOT EXISTS idx_mods_workshop_id ON mods (workshop_id)',
+        'CREATE INDEX IF NOT EXISTS idx_mods_name ON mods (name COLLATE NOCASE)',
+        '''CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,
+            folder TEXT NOT NULL,
+            rel_path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            hash TEXT
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_files_folder ON files (folder)',
+        'CREATE INDEX IF NOT EXISTS idx_files_rel_path ON files (rel_path)',
+        '''CREATE TABLE IF NOT EXISTS issues (
+            mod_file TEXT PRIMARY KEY,
+            mod_name TEXT NOT NULL,
+            missing_version INTEGER NOT NULL,
+            missing_game_version INTEGER NOT NULL,
+            missing_dependencies TEXT NOT NULL
+        )'''
+    ]
+    TABLES = ['directories', 'mods', 'files', 'issues']
+
+    def __init__(self, state_dir: str):
+        self.catalog_path = os.path.join(state_dir, self.CATALOG_NAME)
+        self._connection: Optional[sqlite3.Connection] = None
+        # The serve command and diff hashing use the catalog from worker threads
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Open the catalog on first use, recreating it if the schema version changed"""
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.catalog_path), exist_ok=True)
+            connection = sqlite3.connect(self.catalog_path, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+
+            version = connection.execute('PRAGMA user_version').fetchone()[0]
+            if version != self.SCHEMA_VERSION:
+                if version:
+                    logger.info(f"Catalog schema changed ({version} -> {self.SCHEMA_VERSION}), rebuilding")
+                # The catalog only caches what is on disk, so it is safe to start over
+                for table in self.TABLES:
+                    connection.execute(f'DROP TABLE IF EXISTS {table}')
+                for statement in self.SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+                connection.commit()
+
+            self._connection = connection
+        return self._connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection:
+                self._connection.close()
+                self._connection = None
+
+    def refresh_directory(self, directory: str, is_local: bool) -> bool:
+        """Bring the mods of a directory up to date, returning True if anything changed.
+
+        Mods are launcher .mod files in the directory and Workshop item folders
+        holding a descriptor.mod. The directory is only re-listed when its mtime
+        changed, which happens when a .mod file or item folder is added, removed
+        or renamed. Editing a file in place does not change the directory mtime,
+        so otherwise each catalogued .mod file is stat-ed and re-parsed if its
+        own mtime changed.
+        """
+        if not os.path.isdir(directory):
+            return False
+
+        directory = os.path.abspath(directory)
+        mtime = os.path.getmtime(directory)
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT mtime FROM directories WHERE path = ?', (directory,)
+            ).fetchone()
+            if row and row["mtime"] == mtime:
+                updated, removed = self._refresh_known_mods(directory)
+                if updated or removed:
+                    self._update_issues()
+                    self.connection.commit()
+                    logger.info(f"Catalog refreshed {directory}: {updated} updated, {removed} removed")
+                return bool(updated or removed)
+
+            known = {
+                row["mod_file"]: (row["mtime"], json.loads(row["metadata"]) if row["metadata"] else None)
+                for row in self.connection.execute(
+                    'SELECT mod_file, mtime, metadata FROM mods WHERE directory = ?', (directory,)
+                )
+            }
+            now = datetime.now().isoformat()
+            mod_files: List[Tuple[str, str]] = []
+            item_dirs: List[str] = []
+
+            for name in os.listdir(directory):
+                entry_path = os.path.join(directory, name)
+                if name.endswith('.mod') and os.path.isfile(entry_path):
+                    mod_files.append((name, entry_path))
+                elif os.path.isfile(os.path.join(entry_path, 'descriptor.mod')):
+                    item_dirs.append(name)
+
+            # Folders already described by a launcher .mod file are not catalogued twice
+            referenced = set()
+            parsed: Dict[str, Optional[ModMetadata]] = {}
+            for _, mod_file in mod_files:
+                metadata = known.get(mod_file, (None, None))[1]
+                if known.get(mod_file, (None, None))[0] != os.path.getmtime(mod_file):
+                    metadata = parsed[mod_file] = self._read_metadata(mod_file)
+                if metadata:
+                    referenced.add(ModValidator.resolve_mod_folder(mod_file, metadata))
+            for name in item_dirs:
+                if os.path.join(directory, name) not in referenced:
+                    mod_files.append((f"{name}/descriptor.mod", os.path.join(directory, name, 'descriptor.mod')))
+
+            updated = 0
+            for file_name, mod_file in mod_files:
+                file_mtime = os.path.getmtime(mod_file)
+                if known.get(mod_file, (None, None))[0] == file_mtime:
+                    continue
+                metadata = parsed[mod_file] if mod_file in parsed else self._read_metadata(mod_file)
+                self._store_mod(mod_file, directory, file_name, is_local, file_mtime, metadata, now)
+                updated += 1
+
+            seen = {mod_file for _, mod_file in mod_files}
+            removed = [mod_file for mod_file in known if mod_file not in seen]
+            self.connection.executemany('DELETE FROM mods WHERE mod_file = ?', [(m,) for m in removed])
+            self.connection.executemany('DELETE FROM issues WHERE mod_file = ?', [(m,) for m in removed])
+            self.connection.execute(
+                'INSERT OR REPLACE INTO directories (path, is_local, mtime, scanned_at) VALUES (?, ?, ?, ?)',
+                (directory, int(is_local), mtime, now)
+            )
+            if updated or removed:
+                self._update_issues()
+            self.connection.commit()
+
+        logger.info(f"Catalog refreshed {directory}: {updated} updated, {len(removed)} removed")
+        return bool(updated or removed)
+
+    def _refresh_known_mods(self, directory: str) -> Tuple[int, int]:
+        """Re-parse catalogued .mod files of a directory whose own mtime changed"""
+        rows = self.connection.execute(
+            'SELECT mod_file, file_name, is_local, mtime FROM mods WHERE directory = ?', (directory,)
+        ).fetchall()
+        now = datetime.now().isoformat()
+        updated = 0
+        removed = 0
+
+        for row in rows:
+            mod_file = row["mod_file"]
+            # Descriptors inside Workshop item folders can disappear without touching the directory
+            if not os.path.isfile(mod_file):
+                self.connection.execute('DELETE FROM mods WHERE mod_file = ?', (mod_file,))
+                self.connection.execute('DELETE FROM issues WHERE mod_file = ?', (mod_file,))
+                removed += 1
+                continue
+
+            file_mtime = os.path.getmtime(mod_file)
+            if file_mtime != row["mtime"]:
+                self._store_mod(
+                    mod_file, directory, row["file_name"], bool(row["is_local"]),
+                    file_mtime, self._read_metadata(mod_file), now
+                )
+                updated += 1
+
+        return updated, removed
+
+    def _store_mod(
+        self,
+        mod_file: str,
+        directory: str,
+        file_name: str,
+        is_local: bool,
+        mtime: float,
+        metadata: Optional[ModMetadata],
+        now: str
+    ) -> None:
+        """Write the catalog row of a .mod file"""
+        self.connection.execute(
+            '''INSERT OR REPLACE INTO mods
+               (mod_file, directory, file_name, is_local, mtime, workshop_id, name, metadata, scanned_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            (
+                mod_file, directory, file_name, int(is_local), mtime,
+                metadata["workshop_id"] if metadata else None,
+                metadata["name"] if metadata else None,
+                json.dumps(metadata) if metadata else None,
+                now
+            )
+        )
+
+    @staticmethod
+    def _read_metadata(mod_file: str) -> Optional[ModMetadata]:
+        try:
+            with open(mod_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+            return asyncio.run(ModValidator.extract_metadata(content))
+        except Exception as error:
+            logger.error(f"Error reading mod file: {mod_file}", error)
+            return None
+
+    def _update_issues(self) -> None:
+        """Recompute the issues of every catalogued mod"""
+        mods = [(row["mod_file"], json.loads(row["metadata"])) for row in self.connection.execute(
+            'SELECT mod_file, metadata FROM mods WHERE metadata IS NOT NULL'
+        )]
+        known = {metadata["name"].lower() for _, metadata in mods} | {metadata["workshop_id"] for _, metadata in mods}
+
+        self.connection.execute('DELETE FROM issues')
+        for mod_file, metadata in mods:
+            missing = [
+                dep for dep in metadata.get("dependencies") or []
+                if dep.strip('"').lower() not in known
+            ]
+            missing_version = "mod_version" not in metadata
+            missing_game_version = "game_version" not in metadata
+            if missing_version or missing_game_version or missing:
+                self.connection.execute(
+                    '''INSERT INTO issues
+                       (mod_file, mod_name, missing_version, missing_game_version, missing_dependencies)
+                       VALUES (?, ?, ?, ?, ?)''',
+                    (mod_file, metadata["name"], int(missing_version), int(missing_game_version), json.dumps(missing))
+                )
+
+    def list_mods(self, directory: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get the catalogued mods, optionally limited to one directory.
+
+        Entry format:
+        {"mod_file": str, "directory": str, "file_name": str, "is_local": bool, "metadata": Optional[ModMetadata]}
+        """
+        query = 'SELECT mod_file, directory, file_name, is_local, metadata FROM mods'
+        params: Tuple[Any, ...] = ()
+        if directory is not None:
+            query += ' WHERE directory = ?'
+            params = (os.path.abspath(directory),)
+
+        with self._lock:
+            rows = self.connection.execute(query + ' ORDER BY file_name', params).fetchall()
+        return [self._mod_entry(row) for row in rows]
+
+    def find_mods(self, query: str) -> List[Dict[str, Any]]:
+        """Find mods by remote_file_id or case-insensitive name"""
+        with self._lock:
+            rows = self.connection.execute(
+                '''SELECT mod_file, directory, file_name, is_local, metadata FROM mods
+                   WHERE workshop_id = ? OR name = ? COLLATE NOCASE
+                   ORDER BY is_local''',
+                (query, query)
+            ).fetchall()
+        return [self._mod_entry(row) for row in rows]
+
+    def missing_dependencies(self, metadata: ModMetadata) -> List[str]:
+        """Get the dependencies of a mod that match no catalogued name or remote_file_id"""
+        return [dep for dep in metadata.get("dependencies") or [] if not self.find_mods(dep.strip('"'))]
+
+    def get_metadata(self, mod_file: str) -> Optional[ModMetadata]:
+        """Get the catalogued metadata of a .mod file, re-parsing and storing it if the file changed"""
+        mod_file = os.path.abspath(mod_file)
+        if not os.path.isfile(mod_file):
+            return None
+
+        file_mtime = os.path.getmtime(mod_file)
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT directory, file_name, is_local, mtime, metadata FROM mods WHERE mod_file = ?', (mod_file,)
+            ).fetchone()
+            if not row:
+                return None
+            if row["mtime"] == file_mtime:
+                return json.loads(row["metadata"]) if row["metadata"] else None
+
+            metadata = self._read_metadata(mod_file)
+            self._store_mod(
+                mod_file, row["directory"], row["file_name"], bool(row["is_local"]),
+                file_mtime, metadata, datetime.now().isoformat()
+            )
+            self._update_issues()
+            self.connection.commit()
+        return metadata
+
+    @staticmethod
+    def _mod_entry(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "mod_file": row["mod_file"],
+            "directory": row["directory"],
+            "file_name": row["file_name"],
+            "is_local": bool(row["is_local"]),
+            "metadata": json.loads(row["metadata"]) if row["metadata"] else None
+        }
+
+    def list_issues(self) -> List[Dict[str, Any]]:
+        """Get the catalogued issues in the ModReport issue format"""
+        with self._lock:
+            rows = self.connection.execute('SELECT * FROM issues ORDER BY mod_name').fetchall()
+        return [
+            {
+                "mod_name": row["mod_name"],
+                "missing_version": bool(row["missing_version"]),
+                "missing_game_version": bool(row["missing_game_version"]),
+                "missing_dependencies": json.loads(row["missing_dependencies"])
+            }
+            for row in rows
+        ]
+
+    def get_manifest(self, folder: str) -> Dict[str, Tuple[int, float]]:
+        """Map each file below a folder to its size and mtime, updating the catalogued files.
+
+        Directory mtimes only change for their direct entries and files can be
+        edited in place, so the folder is walked on every call. Only new or
+        changed files are written, unchanged files keep their stored hashes.
+        """
+        folder = os.path.abspath(folder)
+        manifest = ModDiff.build_manifest(folder)
+
+        with self._lock:
+            stored = {
+                r["rel_path"]: (r["size"], r["mtime"])
+                for r in self.connection.execute('SELECT rel_path, size, mtime FROM files WHERE folder = ?', (folder,))
+            }
+            if stored == manifest:
+                return manifest
+
+            self.connection.executemany(
+                'DELETE FROM files WHERE folder = ? AND rel_path = ?',
+                [(folder, rel_path) for rel_path in stored if rel_path not in manifest]
+            )
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO files (path, folder, rel_path, size, mtime, hash) VALUES (?, ?, ?, ?, ?, NULL)',
+                [
+                    (os.path.normpath(os.path.join(folder, rel_path)), folder, rel_path, size, mtime)
+                    for rel_path, (size, mtime) in manifest.items()
+                    if stored.get(rel_path) != (size, mtime)
+                ]
+            )
+            self.connection.commit()
+
+        return manifest
+
+    def file_hash(self, file_path: str) -> str:
+        """Get the SHA-256 hash of a file, reusing the stored one while its size and mtime match.
+
+        Hashes are only stored for files of folders catalogued with get_manifest.
+        """
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+
+        with self._lock:
+            row = self.connection.execute(
+                'SELECT size, mtime, hash FROM files WHERE path = ?', (file_path,)
+            ).fetchone()
+        if row and row["hash"] and row["size"] == stat.st_size and row["mtime"] == stat.st_mtime:
+            return row["hash"]
+
+        file_hash = FileOperations.compute_file_hash(file_path)
+        if row:
+            with self._lock:
+                self.connection.execute(
+                    'UPDATE files SET size = ?, mtime = ?, hash = ? WHERE path = ?',
+                    (stat.st_size, stat.st_mtime, file_hash, file_path)
+                )
+                self.connection.commit()
+        return file_hash
@@ -0,0 +1,134 @@
+import os
+import json
+from typing import Dict, List, Optional, Tuple, Any
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+from utils.mod_validator import ModValidator
+
+
+class LibraryIndex:
+    """In-memory index of the mod library with precomputed JSON responses"""
+    # Folders the game loads from mods, other files such as READMEs cannot conflict
+    GAME_FOLDERS = (
+        'common/', 'data_binding/', 'events/', 'fonts/', 'gfx/', 'gui/', 'history/',
+        'localization/', 'map_data/', 'music/', 'notifications/', 'sound/'
+    )
+
+    def __init__(self, processor: Any):
+        self.processor = processor
+        self.responses: Dict[str, bytes] = {}
+        self.signature: Tuple[float, ...] = ()
+
+    def _directories(self) -> List[Tuple[str, bool]]:
+        return [
+            (self.processor.config["workshop_path"], False),
+            (self.processor.config["local_mods_path"], True)
+        ]
+
+    def compute_signature(self) -> Tuple[float, ...]:
+        """Get the mtimes that change whenever the library or the processed output changes"""
+        paths = [directory for directory, _ in self._directories()]
+        paths.append(str(self.processor.output_path))
+        paths.append(self.processor.journal.journal_path)
+        return tuple(os.path.getmtime(path) if os.path.exists(path) else 0.0 for path in paths)
+
+    def is_stale(self) -> bool:
+        """Check for library changes, bringing the catalog of changed .mod files up to date.
+
+        Steam updates Workshop items and users edit .mod files in place, which
+        changes no watched mtime, so each directory is refreshed in the catalog.
+        """
+        catalog = self.processor.catalog
+        changed = [catalog.refresh_directory(directory, is_local) for directory, is_local in self._directories()]
+        if any(changed):
+            # The catalog is already up to date, stay stale until the index is rebuilt
+            self.signature = ()
+        return self.compute_signature() != self.signature
+
+    def _mod_record(self, mod: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the response record of a catalogued mod"""
+        metadata = mod["metadata"]
+        dest_path = self.processor.get_dest_path(metadata, mod["is_local"])
+        return {
+            "id": metadata["workshop_id"],
+            "name": metadata["name"],
+            "mod_version": metadata.get("mod_version"),
+            "game_version": metadata.get("game_version"),
+            "tags": [tag.strip('"') for tag in metadata.get("tags") or []],
+            "dependencies": [dep.strip('"') for dep in metadata.get("dependencies") or []],
+            "is_local": mod["is_local"],
+            "mod_file": mod["mod_file"],
+            "mod_folder": ModValidator.resolve_mod_folder(mod["mod_file"], metadata),
+            "compatible": ModValidator.supports_game_version(metadata, self.processor.GAME_VERSION),
+            "dest_path": str(dest_path),
+            "processed": dest_path.is_dir()
+        }
+
+    def _manifest(self, record: Dict[str, Any]) -> List[str]:
+        """List the files of a mod, from its content folder or its processed copy"""
+        folder = record["mod_folder"] or record["dest_path"]
+        if not os.path.isdir(folder):
+            return []
+        return list(self.processor.catalog.get_manifest(folder))
+
+    def build(self) -> None:
+        """Rebuild every index and its JSON response"""
+        signature = self.compute_signature()
+        catalog = self.processor.catalog
+        mods: List[Dict[str, Any]] = []
+        for directory, is_local in self._directories():
+            if not os.path.isdir(directory):
+                continue
+            # Unchanged directories are served straight from the catalog
+            catalog.refresh_directory(directory, is_local)
+            mods.extend(self._mod_record(mod) for mod in catalog.list_mods(directory) if mod["metadata"])
+
+        issues = catalog.list_issues()
+        dependents: Dict[str, List[str]] = {}
+        for mod in mods:
+            for dep in mod["dependencies"]:
+                dependents.setdefault(dep, []).append(mod["name"])
+
+        versions: Dict[str, List[str]] = {}
+        for mod in mods:
+            versions.setdefault(mod["game_version"] or "gvUnknown", []).append(mod["name"])
+
+        # Files provided by more than one mod, where load order decides the winner
+        providers: Dict[str, List[str]] = {}
+        for mod in mods:
+            for rel_path in self._manifest(mod):
+                if rel_path.startswith(self.GAME_FOLDERS):
+                    providers.setdefault(rel_path, []).append(mod["name"])
+        conflicts = {rel_path: names for rel_path, names in sorted(providers.items()) if len(names) > 1}
+
+        dependencies = {
+            mod["name"]: {
+                "requires": mod["dependencies"],
+                "required_by": dependents.get(mod["name"], [])
+            }
+            for mod in mods
+        }
+
+        responses = {
+            "/mods": self._encode(mods),
+            "/issues": self._encode(issues),
+            "/conflicts": self._encode(conflicts),
+            "/dependencies": self._encode(dependencies),
+            "/versions": self._encode(versions),
+            "/health": self._encode({"mods": len(mods), "game_version": self.processor.GAME_VERSION})
+        }
+        for mod in mods:
+            responses[f"/mods/{mod['id']}"] = self._encode(mod)
+
+        # Swap in the new responses in one assignment so readers never see a partial index
+        self.responses = responses
+        self.signature = signature
+        logger.info(f"Library index built: {len(mods)} mods, {len(issues)} with issues, {len(conflicts)} conflicting files")
+
+    @staticmethod
+    def _encode(data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode('utf-8')
+
+    def get(self, path: str) -> Optional[bytes]:
+        return self.responses.get(path.rstrip('/') or '/health')
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from typing import Optional
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+from utils.library_index import LibraryIndex
+
+
+class LibraryServer:
+    """Read-only HTTP/JSON service answering queries from a LibraryIndex"""
+    STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+    def __init__(self, index: LibraryIndex, host: str = '127.0.0.1', port: int = 8765, refresh_seconds: float = 10):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.refresh_seconds = refresh_seconds
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer a single HTTP request and close the connection"""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').strip()
+            # Drain the headers, nothing in them changes the response
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+
+            parts = request_line.split()
+            if len(parts) != 3:
+                status, body = 400, self._error('Malformed request')
+            elif parts[0] not in ('GET', 'HEAD'):
+                status, body = 405, self._error('Only GET requests are supported')
+            else:
+                path = parts[1].split('?', 1)[0]
+                body = self.index.get(path)
+                status = 200 if body is not None else 404
+                if body is None:
+                    body = self._error(f"Unknown endpoint: {path}")
+
+            headers = (
+                f"HTTP/1.1 {status} {self.STATUS_TEXT[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n"
+            )
+            writer.write(headers.encode('latin-1'))
+            if parts and parts[0] != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+        except Exception as error:
+            logger.error('Error handling request', error)
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _error(message: str) -> bytes:
+        return json.dumps({"error": message}).encode('utf-8')
+
+    async def refresh_loop(self) -> None:
+        """Rebuild the index whenever the library or the processed output changes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                if await loop.run_in_executor(None, self.index.is_stale):
+                    logger.info('Library changed, refreshing index')
+                    await loop.run_in_executor(None, self.index.build)
+            except Exception as error:
+                logger.error('Error refreshing library index', error)
+
+    async def serve(self) -> None:
+        """Build the index and serve requests until cancelled"""
+        loop = asyncio.get_running_loop()
+        # Building reads every mod file, keep it off the event loop
+        await loop.run_in_executor(None, self.index.build)
+
+        self._server = await asyncio.start_server(self.handle_request, self.host, self.port)
+        logger.info(f"Serving library index on http://{self.host}:{self.port}")
+        logger.info('Endpoints: /health /mods /mods/<id> /issues /conflicts /dependencies /versions')
+
+        refresh_task = asyncio.create_task(self.refresh_loop())
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            refresh_task.cancel()
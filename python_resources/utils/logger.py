@@ -16,10 +16,12 @@ class Logger:
         self.log_dir = log_dir
         today = datetime.now().strftime("%Y-%m-%d")
         self.current_log_file = os.path.join(self.log_dir, f"ck3-workshop-{today}.log")
+        self.console = True
 
-    def init(self) -> None:
-        """Initialize the logger by creating the log directory"""
+    def init(self, console: bool = True) -> None:
+        """Initialize the logger by creating the log directory, optionally logging to the file only"""
         os.makedirs(self.log_dir, exist_ok=True)
+        self.console = console
 
     def format_message(self, level: LogLevel, message: str) -> str:
         """Format a log message with timestamp and level"""
@@ -29,7 +31,8 @@ class Logger:
     def log(self, level: LogLevel, message: str) -> None:
         """Log a message to console and file"""
         formatted_message = self.format_message(level, message)
-        print(formatted_message)
+        if self.console:
+            print(formatted_message)
         
         try:
             with open(self.current_log_file, mode='a') as f:
@@ -0,0 +1,223 @@
+import os
+import re
+import concurrent.futures
+from typing import Dict, List, Optional, Tuple, Any, Callable
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+from utils.file_operations import FileOperations
+
+
+class ModDiff:
+    SCRIPT_EXTENSIONS = ('.txt', '.gui', '.gfx')
+    LOCALIZATION_EXTENSIONS = ('.yml',)
+
+    token_pattern = re.compile(r'"(?:[^"\\]|\\.)*"|#[^\n]*|[{}]|[<>!?]?=|[<>]|[^\s{}=<>!?#"]+')
+    operator_pattern = re.compile(r'^(?:[<>!?]?=|[<>])$')
+    localization_pattern = re.compile(r'^\s*([^\s:#"]+):\d*\s*"(.*)"')
+
+    @staticmethod
+    def build_manifest(root: str) -> Dict[str, Tuple[int, float]]:
+        """Map each file below root to its size and modification time"""
+        if not os.path.isdir(root):
+            raise NotADirectoryError(f"Not a mod directory: {root}")
+
+        manifest: Dict[str, Tuple[int, float]] = {}
+        for dir_path, _, files in os.walk(root):
+            for file in files:
+                file_path = os.path.join(dir_path, file)
+                stat = os.stat(file_path)
+                rel_path = os.path.relpath(file_path, root).replace(os.sep, '/')
+                manifest[rel_path] = (stat.st_size, stat.st_mtime)
+        return manifest
+
+    @classmethod
+    def compare(
+        cls,
+        path_a: str,
+        path_b: str,
+        hash_file: Callable[[str], str] = FileOperations.compute_file_hash,
+        build_manifest: Optional[Callable[[str], Dict[str, Tuple[int, float]]]] = None
+    ) -> Dict[str, Any]:
+        """Compare two mod directories, hashing file contents with hash_file.
+
+        build_manifest lists the files of a directory, such as the catalog's
+        get_manifest, and defaults to walking it directly.
+
+        Result format:
+        {
+            "added": List[str],
+            "removed": List[str],
+            "modified": List[str],
+            "unchanged": int,
+            "structural": Dict[str, Dict[str, List[str]]]
+        }
+        """
+        build_manifest = build_manifest or cls.build_manifest
+        manifest_a = build_manifest(path_a)
+        manifest_b = build_manifest(path_b)
+        root_a, root_b = path_a, path_b
+
+        added = sorted(set(manifest_b) - set(manifest_a))
+        removed = sorted(set(manifest_a) - set(manifest_b))
+        modified: List[str] = []
+        unchanged = 0
+        to_hash: List[str] = []
+
+        for rel_path in sorted(set(manifest_a) & set(manifest_b)):
+            size_a, mtime_a = manifest_a[rel_path]
+            size_b, mtime_b = manifest_b[rel_path]
+            if size_a != size_b:
+                modified.append(rel_path)
+            elif int(mtime_a) == int(mtime_b):
+                # Same size and mtime, assume the contents match
+                unchanged += 1
+            else:
+                to_hash.append(rel_path)
+
+        # Only files whose size matches but mtime differs need their contents hashed
+        with concurrent.futures.ThreadPoolExecutor(max_workers=FileOperations.MAX_WORKERS) as executor:
+            hashes = {
+                rel_path: (
+                    executor.submit(hash_file, os.path.join(root_a, rel_path)),
+                    executor.submit(hash_file, os.path.join(root_b, rel_path))
+                )
+                for rel_path in to_hash
+            }
+            for rel_path, (hash_a, hash_b) in hashes.items():
+                if hash_a.result() != hash_b.result():
+                    modified.append(rel_path)
+                else:
+                    unchanged += 1
+
+        modified.sort()
+        structural = {}
+        for rel_path in modified:
+            try:
+                changes = cls.structural_diff(
+                    rel_path,
+                    os.path.join(root_a, rel_path),
+                    os.path.join(root_b, rel_path)
+                )
+            except Exception as error:
+                logger.error(f"Error comparing {rel_path}", error)
+                continue
+            if changes:
+                structural[rel_path] = changes
+
+        return {
+            "added": added,
+            "removed": removed,
+            "modified": modified,
+            "unchanged": unchanged,
+            "structural": structural
+        }
+
+    @classmethod
+    def structural_diff(cls, rel_path: str, file_a: str, file_b: str) -> Dict[str, List[str]]:
+        """Diff the objects defined in a script or localization file"""
+        lower_path = rel_path.lower()
+        if lower_path.endswith(cls.LOCALIZATION_EXTENSIONS):
+            parse = cls.parse_localization
+        elif lower_path.endswith(cls.SCRIPT_EXTENSIONS):
+            parse = cls.parse_script_objects
+        else:
+            return {}
+
+        objects_a = parse(cls._read_text(file_a))
+        objects_b = parse(cls._read_text(file_b))
+        return {
+            "added": sorted(set(objects_b) - set(objects_a)),
+            "removed": sorted(set(objects_a) - set(objects_b)),
+            "changed": sorted(
+                key for key in set(objects_a) & set(objects_b)
+                if objects_a[key] != objects_b[key]
+            )
+        }
+
+    @staticmethod
+    def _read_text(file_path: str) -> str:
+        with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            return f.read()
+
+    @classmethod
+    def parse_script_objects(cls, content: str) -> Dict[str, str]:
+        """Map each top level key of a Paradox script file to its normalized value"""
+        tokens = [token for token in cls.token_pattern.findall(content) if not token.startswith('#')]
+        objects: Dict[str, str] = {}
+        index = 0
+
+        while index < len(tokens):
+            key = tokens[index]
+            index += 1
+            value_tokens: List[str] = []
+
+            if index < len(tokens) and cls.operator_pattern.match(tokens[index]):
+                value_tokens.append(tokens[index])
+                index += 1
+                if index < len(tokens) and tokens[index] == '{':
+                    depth = 0
+                    while index < len(tokens):
+                        token = tokens[index]
+                        value_tokens.append(token)
+                        index += 1
+                        if token == '{':
+                            depth += 1
+                        elif token == '}':
+                            depth -= 1
+                            if depth == 0:
+                                break
+                elif index < len(tokens):
+                    value_tokens.append(tokens[index])
+                    index += 1
+
+            # Keys such as namespace or on_action hooks may repeat within a file
+            unique_key = key
+            occurrence = 1
+            while unique_key in objects:
+                occurrence += 1
+                unique_key = f"{key}#{occurrence}"
+            objects[unique_key] = ' '.join(value_tokens)
+
+        return objects
+
+    @classmethod
+    def parse_localization(cls, content: str) -> Dict[str, str]:
+        """Map each localization key to its text"""
+        entries: Dict[str, str] = {}
+        for line in content.splitlines():
+            match = cls.localization_pattern.match(line)
+            if match:
+                entries[match.group(1)] = match.group(2)
+        return entries
+
+    @staticmethod
+    def format_report(diff: Dict[str, Any], label_a: str, label_b: str) -> str:
+        """Format a comparison result for display"""
+        lines = [f"Comparing {label_a} -> {label_b}", '']
+        lines.append(
+            f"{len(diff['added'])} added, {len(diff['removed'])} removed, "
+            f"{len(diff['modified'])} modified, {diff['unchanged']} unchanged"
+        )
+
+        for title, key, marker in (('Added files', 'added', '+'), ('Removed files', 'removed', '-')):
+            if diff[key]:
+                lines.append('')
+                lines.append(f"{title}:")
+                for rel_path in diff[key]:
+                    lines.append(f"  {marker} {rel_path}")
+
+        if diff['modified']:
+            lines.append('')
+            lines.append('Modified files:')
+            for rel_path in diff['modified']:
+                lines.append(f"  ~ {rel_path}")
+                changes = diff['structural'].get(rel_path, {})
+                for key in changes.get('added', []):
+                    lines.append(f"      + {key}")
+                for key in changes.get('removed', []):
+                    lines.append(f"      - {key}")
+                for key in changes.get('changed', []):
+                    lines.append(f"      ~ {key}")
+
+        return '\n'.join(lines)
@@ -0,0 +1,117 @@
+import json
+from fnmatch import fnmatch
+from typing import Dict, List, Optional, Set, Any
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+from utils.mod_validator import ModMetadata, ModValidator
+
+
+class ModFilter:
+    """Select a subset of mods by name, remote_file_id, tag, compatibility or playset"""
+
+    def __init__(
+        self,
+        name_patterns: Optional[List[str]] = None,
+        remote_file_ids: Optional[List[str]] = None,
+        tags: Optional[List[str]] = None,
+        compatible_only: bool = False,
+        playset_path: Optional[str] = None
+    ):
+        self.name_patterns = [pattern.lower() for pattern in name_patterns or []]
+        self.remote_file_ids: Set[str] = {str(mod_id) for mod_id in remote_file_ids or []}
+        self.tags: Set[str] = {tag.lower() for tag in tags or []}
+        self.compatible_only = compatible_only
+        self.playset_ids: Set[str] = set()
+        self.playset_names: Set[str] = set()
+        self.playset_path = playset_path
+
+        if playset_path:
+            playset = self.load_playset(playset_path)
+            self.playset_ids = playset["ids"]
+            self.playset_names = playset["names"]
+
+    @staticmethod
+    def load_playset(playset_path: str) -> Dict[str, Set[str]]:
+        """Load the enabled mods of a playset exported from the Paradox launcher.
+
+        Expected format:
+        {
+            "name": str,
+            "mods": [
+                {"displayName": str, "steamId": str, "enabled": bool, "position": int}
+            ]
+        }
+        """
+        with open(playset_path, 'r', encoding='utf-8') as f:
+            playset = json.load(f)
+
+        ids: Set[str] = set()
+        names: Set[str] = set()
+        for mod in playset.get("mods", []):
+            if not mod.get("enabled", True):
+                continue
+            if mod.get("steamId"):
+                ids.add(str(mod["steamId"]))
+            if mod.get("displayName"):
+                names.add(mod["displayName"].lower())
+
+        logger.info(f"Loaded playset '{playset.get('name', playset_path)}' with {len(ids | names)} enabled mods")
+        return {"ids": ids, "names": names}
+
+    @classmethod
+    def from_args(cls, args: Any) -> "ModFilter":
+        """Build a filter from parsed command line arguments"""
+        return cls(
+            name_patterns=args.name,
+            remote_file_ids=args.id,
+            tags=args.tag,
+            compatible_only=args.compatible,
+            playset_path=args.playset
+        )
+
+    def is_active(self) -> bool:
+        """Check if any filter option has been set"""
+        return bool(
+            self.name_patterns or self.remote_file_ids or self.tags
+            or self.compatible_only or self.playset_path
+        )
+
+    def describe(self) -> str:
+        """Get a short human readable description of the active filters"""
+        parts = []
+        if self.name_patterns:
+            parts.append(f"name={','.join(self.name_patterns)}")
+        if self.remote_file_ids:
+            parts.append(f"id={','.join(sorted(self.remote_file_ids))}")
+        if self.tags:
+            parts.append(f"tag={','.join(sorted(self.tags))}")
+        if self.compatible_only:
+            parts.append("compatible")
+        if self.playset_path:
+            parts.append(f"playset={self.playset_path}")
+        return ' '.join(parts) if parts else 'none'
+
+    def matches(self, metadata: ModMetadata, game_version: str) -> bool:
+        """Check if a mod passes every active filter"""
+        name = metadata["name"].lower()
+        workshop_id = str(metadata.get("workshop_id", ""))
+
+        if self.name_patterns and not any(fnmatch(name, pattern) for pattern in self.name_patterns):
+            return False
+
+        if self.remote_file_ids and workshop_id not in self.remote_file_ids:
+            return False
+
+        if self.tags:
+            mod_tags = {tag.strip('"').lower() for tag in metadata.get("tags") or []}
+            if not self.tags & mod_tags:
+                return False
+
+        if self.playset_path and workshop_id not in self.playset_ids and name not in self.playset_names:
+            return False
+
+        if self.compatible_only and not ModValidator.supports_game_version(metadata, game_version):
+            return False
+
+        return True
@@ -1,6 +1,7 @@
 import os
 import re
 import asyncio
+from fnmatch import fnmatch
 import aiofiles
 from typing import Dict, List, Optional, TypedDict, Any
 
@@ -15,6 +16,7 @@ class ModMetadata(TypedDict, total=False):
     dependencies: Optional[List[str]]
     workshop_id: str
     tags: Optional[List[str]]
+    path: Optional[str]
 
 
 class ModValidator:
@@ -22,6 +24,7 @@ class ModValidator:
     game_version_pattern = re.compile(r'supported_version\s*=\s*"?([^"\s}]+)"?')
     dependency_pattern = re.compile(r'dependencies\s*=\s*\{([^}]+)\}')
     tag_pattern = re.compile(r'tags\s*=\s*\{([^}]+)\}')
+    path_pattern = re.compile(r'^\s*path\s*=\s*"?([^"\n]+?)"?\s*$', re.MULTILINE)
 
     @staticmethod
     def format_mod_version(version: str) -> str:
@@ -47,24 +50,65 @@ class ModValidator:
             metadata = await cls.extract_metadata(content)
             
             if not metadata:
-                await logger.warn(f"Failed to extract metadata from {mod_file_path}")
+                logger.warn(f"Failed to extract metadata from {mod_file_path}")
                 return None
 
-            # Validate mod folder exists
-            if not os.path.exists(mod_folder_path):
-                await logger.error(f"Mod folder not found: {mod_folder_path}")
+            if not await cls.validate_mod_folder(mod_folder_path):
                 return None
 
-            # Validate descriptor.mod exists in mod folder
-            descriptor_path = os.path.join(mod_folder_path, 'descriptor.mod')
-            if not os.path.exists(descriptor_path):
-                await logger.warn(f"descriptor.mod not found in {mod_folder_path}")
-
             return metadata
         except Exception as error:
-            await logger.error(f"Error validating mod: {mod_file_path}", error)
+            logger.error(f"Error validating mod: {mod_file_path}", error)
             return None
 
+    @staticmethod
+    async def validate_mod_folder(mod_folder_path: Optional[str]) -> bool:
+        """Check that a mod's content folder exists and has a descriptor"""
+        # Validate mod folder exists
+        if not mod_folder_path or not os.path.isdir(mod_folder_path):
+            logger.error(f"Mod folder not found: {mod_folder_path}")
+            return False
+
+        # Validate descriptor.mod exists in mod folder
+        descriptor_path = os.path.join(mod_folder_path, 'descriptor.mod')
+        if not os.path.exists(descriptor_path):
+            logger.warn(f"descriptor.mod not found in {mod_folder_path}")
+
+        return True
+
+    @staticmethod
+    def resolve_mod_folder(mod_file_path: str, metadata: ModMetadata) -> Optional[str]:
+        """Find the content folder of a mod described by a .mod file.
+
+        A Workshop item's descriptor.mod lives in the content folder itself.
+        Launcher .mod files point to it with path=, which is either absolute or
+        relative to the game's user directory (the parent of the mod directory).
+        Without path=, the Workshop item folder named after remote_file_id or a
+        folder named after the .mod file is used.
+        """
+        mod_file_path = os.path.abspath(mod_file_path)
+        mod_directory = os.path.dirname(mod_file_path)
+
+        if os.path.basename(mod_file_path) == 'descriptor.mod':
+            return mod_directory
+
+        candidates = []
+        if metadata.get("path"):
+            path = metadata["path"]
+            if os.path.isabs(path):
+                candidates.append(path)
+            else:
+                candidates.append(os.path.join(os.path.dirname(mod_directory), path))
+                candidates.append(os.path.join(mod_directory, path))
+        if metadata.get("workshop_id"):
+            candidates.append(os.path.join(mod_directory, metadata["workshop_id"]))
+        candidates.append(os.path.splitext(mod_file_path)[0])
+
+        for candidate in candidates:
+            if os.path.isdir(candidate):
+                return os.path.normpath(candidate)
+        return None
+
     @classmethod
     async def extract_metadata(cls, content: str) -> Optional[ModMetadata]:
         """Extract metadata from mod file content"""
@@ -79,6 +123,11 @@ class ModValidator:
             "workshop_id": workshop_id_match.group(1) or workshop_id_match.group(2)
         }
 
+        # Extract the content folder of launcher .mod files
+        path_match = cls.path_pattern.search(content)
+        if path_match:
+            metadata["path"] = path_match.group(1)
+
         # Extract and format mod version
         version_match = cls.version_pattern.search(content)
         if version_match:
@@ -93,9 +142,9 @@ class ModValidator:
 
         # Log version information
         if "mod_version" in metadata:
-            await logger.info(f"Mod version detected: {metadata['mod_version']}")
+            logger.info(f"Mod version detected: {metadata['mod_version']}")
         if "game_version" in metadata:
-            await logger.info(f"Game version detected: {metadata['game_version']}")
+            logger.info(f"Game version detected: {metadata['game_version']}")
 
         # Extract dependencies
         dependency_match = cls.dependency_pattern.search(content)
@@ -128,7 +177,7 @@ class ModValidator:
         for dependency in metadata["dependencies"]:
             dependency_path = os.path.join(mod_base_path, dependency)
             if not os.path.exists(dependency_path):
-                await logger.warn(f"Missing dependency for {metadata['name']}: {dependency}")
+                logger.warn(f"Missing dependency for {metadata['name']}: {dependency}")
                 return False
 
         return True
@@ -137,11 +186,23 @@ class ModValidator:
     async def check_game_version(cls, metadata: ModMetadata, required_version: str) -> bool:
         """Check if the mod supports the required game version"""
         if "game_version" not in metadata:
-            await logger.warn(f"No game version specified for mod: {metadata['name']}")
+            logger.warn(f"No game version specified for mod: {metadata['name']}")
+            return False
+
+        return cls.supports_game_version(metadata, required_version)
+
+    @classmethod
+    def supports_game_version(cls, metadata: ModMetadata, required_version: str) -> bool:
+        """Check the game version without logging, for filtering many mods at once.
+
+        Descriptors usually declare wildcards such as supported_version="1.14.*",
+        so '*' in the mod's version matches any part of the required version.
+        """
+        if "game_version" not in metadata:
             return False
 
         required_formatted = cls.format_game_version(required_version)
-        return metadata["game_version"] == required_formatted
+        return fnmatch(required_formatted, metadata["game_version"])
 
     @staticmethod
     def get_version_string(metadata: ModMetadata) -> str:
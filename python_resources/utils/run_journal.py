@@ -0,0 +1,125 @@
+import os
+import json
+import shutil
+from datetime import datetime
+from typing import Dict, Set, Optional, Any, TextIO
+
+# Assuming logger is imported from another module
+from utils.logger import logger
+
+
+class RunJournal:
+    """Write-ahead journal of mod processing progress, used to resume failed runs.
+
+    Each line of the journal is a JSON record:
+    {"event": "run_start" | "mod_start" | "file_done" | "mod_done" | "run_done",
+     "mod": Optional[str], "file": Optional[str], "time": str}
+    """
+    JOURNAL_NAME = 'journal.jsonl'
+    STAGING_DIR = 'staging'
+
+    def __init__(self, state_dir: str):
+        self.journal_path = os.path.join(state_dir, self.JOURNAL_NAME)
+        self.staging_root = os.path.join(state_dir, self.STAGING_DIR)
+        self.completed_mods: Set[str] = set()
+        self.in_flight_mods: Dict[str, Set[str]] = {}
+        self.previous_run_finished = True
+        self._file: Optional[TextIO] = None
+
+    def load(self) -> None:
+        """Replay the journal left by a previous run"""
+        self.completed_mods.clear()
+        self.in_flight_mods.clear()
+        self.previous_run_finished = True
+
+        if not os.path.exists(self.journal_path):
+            return
+
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave the last record half written
+                    continue
+
+                event = record.get("event")
+                mod = record.get("mod")
+                if event == "run_start":
+                    self.previous_run_finished = False
+                elif event == "run_done":
+                    self.previous_run_finished = True
+                elif event == "mod_start":
+                    # A completed mod is restarted when its output was deleted
+                    self.completed_mods.discard(mod)
+                    self.in_flight_mods.setdefault(mod, set())
+                elif event == "file_done" and mod in self.in_flight_mods:
+                    self.in_flight_mods[mod].add(record["file"])
+                elif event == "mod_done":
+                    self.in_flight_mods.pop(mod, None)
+                    self.completed_mods.add(mod)
+
+    def start(self, resume: bool) -> None:
+        """Open the journal for a new run, either resuming or starting fresh"""
+        self.load()
+
+        if resume:
+            logger.info(
+                f"Resuming run: {len(self.completed_mods)} mods completed, "
+                f"{len(self.in_flight_mods)} mods in flight"
+            )
+        else:
+            if not self.previous_run_finished:
+                logger.warn("Previous run did not complete, starting fresh (use --resume to continue it)")
+            self.completed_mods.clear()
+            self.in_flight_mods.clear()
+            if os.path.exists(self.staging_root):
+                shutil.rmtree(self.staging_root)
+            if os.path.exists(self.journal_path):
+                os.unlink(self.journal_path)
+
+        os.makedirs(self.staging_root, exist_ok=True)
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._write({"event": "run_start"}, sync=True)
+
+    def _write(self, record: Dict[str, Any], sync: bool = False) -> None:
+        """Append a record to the journal, optionally forcing it to disk"""
+        if not self._file:
+            return
+        record["time"] = datetime.now().isoformat()
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def staging_path(self, mod: str) -> str:
+        """Get the temporary destination a mod is copied to before being renamed"""
+        return os.path.join(self.staging_root, mod)
+
+    def done_files(self, mod: str) -> Set[str]:
+        """Get the files of an in-flight mod that were already copied and verified"""
+        return self.in_flight_mods.get(mod, set())
+
+    def mod_started(self, mod: str, source: str) -> None:
+        self.completed_mods.discard(mod)
+        self.in_flight_mods.setdefault(mod, set())
+        self._write({"event": "mod_start", "mod": mod, "source": source}, sync=True)
+
+    def file_done(self, mod: str, file: str) -> None:
+        self.in_flight_mods.setdefault(mod, set()).add(file)
+        self._write({"event": "file_done", "mod": mod, "file": file})
+
+    def mod_done(self, mod: str) -> None:
+        self.in_flight_mods.pop(mod, None)
+        self.completed_mods.add(mod)
+        self._write({"event": "mod_done", "mod": mod}, sync=True)
+
+    def finish(self) -> None:
+        """Mark the run as complete and close the journal"""
+        self._write({"event": "run_done"}, sync=True)
+        self.close()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,14 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The tool modules import each other as top-level "utils.*" packages
+sys.path.insert(0, str(Path(__file__).parent.parent / "python_resources"))
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    """Run every test in its own directory so logs and outputs stay out of the repo"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,155 @@
+import os
+import sqlite3
+
+import pytest
+
+from utils.library_catalog import LibraryCatalog
+
+
+def write_mod(path, name, remote_file_id, extra=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'version="1.0"\nname="{name}"\nsupported_version="1.11.*"\nremote_file_id="{remote_file_id}"\n{extra}')
+
+
+def edit_in_place(path, content, directory):
+    """Rewrite a file without changing its directory's mtime"""
+    directory_stat = os.stat(directory)
+    stat = os.stat(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(content)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    os.utime(directory, (directory_stat.st_atime, directory_stat.st_mtime))
+
+
+@pytest.fixture
+def library(tmp_path):
+    mod_dir = tmp_path / "mod"
+    write_mod(str(mod_dir / "travelers.mod"), "Travelers", "1")
+    write_mod(str(mod_dir / "agot.mod"), "AGOT Compatibility", "2", 'path="mod/agot"\n')
+    write_mod(str(mod_dir / "agot" / "descriptor.mod"), "AGOT Compatibility", "2")
+    write_mod(str(mod_dir / "3" / "descriptor.mod"), "Workshop Item", "3")
+    catalog = LibraryCatalog(str(tmp_path / "state"))
+    yield str(mod_dir), catalog
+    catalog.close()
+
+
+def names(catalog, directory):
+    return sorted(mod["file_name"] for mod in catalog.list_mods(directory))
+
+
+def test_refresh_catalogs_mod_files_and_workshop_items(library):
+    mod_dir, catalog = library
+
+    assert catalog.refresh_directory(mod_dir, False)
+    # The agot folder is described by agot.mod and is not catalogued twice
+    assert names(catalog, mod_dir) == ["3/descriptor.mod", "agot.mod", "travelers.mod"]
+    assert catalog.find_mods("travelers")[0]["metadata"]["workshop_id"] == "1"
+    assert catalog.find_mods("3")[0]["file_name"] == "3/descriptor.mod"
+
+
+def test_unchanged_directory_is_not_rescanned(library):
+    mod_dir, catalog = library
+    catalog.refresh_directory(mod_dir, False)
+
+    assert not catalog.refresh_directory(mod_dir, False)
+
+
+def test_in_place_edit_is_picked_up(library):
+    mod_dir, catalog = library
+    catalog.refresh_directory(mod_dir, False)
+
+    edit_in_place(os.path.join(mod_dir, "travelers.mod"), 'tags={\n"Fixes"\n}\n', mod_dir)
+
+    assert catalog.refresh_directory(mod_dir, False)
+    assert catalog.find_mods("1")[0]["metadata"]["tags"] == ['"Fixes"']
+
+
+def test_added_and_removed_mods(library):
+    mod_dir, catalog = library
+    catalog.refresh_directory(mod_dir, False)
+
+    os.unlink(os.path.join(mod_dir, "travelers.mod"))
+    write_mod(os.path.join(mod_dir, "new.mod"), "New", "4")
+
+    assert catalog.refresh_directory(mod_dir, False)
+    assert names(catalog, mod_dir) == ["3/descriptor.mod", "agot.mod", "new.mod"]
+
+
+def test_get_metadata_updates_changed_and_ignores_missing_files(library):
+    mod_dir, catalog = library
+    catalog.refresh_directory(mod_dir, False)
+    mod_file = os.path.join(mod_dir, "travelers.mod")
+
+    edit_in_place(mod_file, 'dependencies={\n"Missing Mod"\n}\n', mod_dir)
+
+    assert catalog.get_metadata(mod_file)["dependencies"] == ['"Missing Mod"']
+    assert catalog.find_mods("1")[0]["metadata"]["dependencies"] == ['"Missing Mod"']
+    assert catalog.list_issues()[0]["missing_dependencies"] == ['"Missing Mod"']
+
+    os.unlink(mod_file)
+    assert catalog.get_metadata(mod_file) is None
+
+
+def test_issues_are_recorded(library):
+    mod_dir, catalog = library
+    with open(os.path.join(mod_dir, "unversioned.mod"), 'w') as f:
+        f.write('name="Unversioned"\nremote_file_id="5"\n')
+
+    catalog.refresh_directory(mod_dir, False)
+
+    assert catalog.list_issues() == [{
+        "mod_name": "Unversioned",
+        "missing_version": True,
+        "missing_game_version": True,
+        "missing_dependencies": []
+    }]
+
+
+def test_catalog_is_rebuilt_on_schema_change(library):
+    mod_dir, catalog = library
+    catalog.refresh_directory(mod_dir, False)
+    catalog.close()
+
+    connection = sqlite3.connect(catalog.catalog_path)
+    connection.execute(f'PRAGMA user_version = {LibraryCatalog.SCHEMA_VERSION + 1}')
+    connection.commit()
+    connection.close()
+
+    assert catalog.list_mods(mod_dir) == []
+    assert catalog.refresh_directory(mod_dir, False)
+
+
+def test_file_hash_is_only_stored_for_catalogued_folders(library, tmp_path):
+    _, catalog = library
+    folder = tmp_path / "content"
+    write_mod(str(folder / "descriptor.mod"), "Travelers", "1")
+    loose_file = tmp_path / "loose.txt"
+    loose_file.write_text("loose")
+
+    catalog.file_hash(str(loose_file))
+    assert catalog.connection.execute('SELECT COUNT(*) FROM files').fetchone()[0] == 0
+
+    assert list(catalog.get_manifest(str(folder))) == ["descriptor.mod"]
+    file_hash = catalog.file_hash(str(folder / "descriptor.mod"))
+    stored = catalog.connection.execute('SELECT hash FROM files').fetchall()
+    assert [row["hash"] for row in stored] == [file_hash]
+
+
+def test_manifest_sees_changes_in_subfolders(library, tmp_path):
+    _, catalog = library
+    folder = tmp_path / "content"
+    write_mod(str(folder / "descriptor.mod"), "Travelers", "1")
+    (folder / "common").mkdir()
+    (folder / "common" / "a.txt").write_text("a")
+    assert sorted(catalog.get_manifest(str(folder))) == ["common/a.txt", "descriptor.mod"]
+    catalog.file_hash(str(folder / "descriptor.mod"))
+
+    folder_stat = os.stat(folder)
+    (folder / "common" / "b.txt").write_text("b")
+    # Adding a file to a subfolder leaves the top-level folder mtime alone
+    assert os.stat(folder).st_mtime == folder_stat.st_mtime
+
+    assert sorted(catalog.get_manifest(str(folder))) == ["common/a.txt", "common/b.txt", "descriptor.mod"]
+    hashes = catalog.connection.execute('SELECT rel_path FROM files WHERE hash IS NOT NULL').fetchall()
+    assert [row["rel_path"] for row in hashes] == ["descriptor.mod"]
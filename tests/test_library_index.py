@@ -0,0 +1,110 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from index import ModProcessor
+from utils.library_index import LibraryIndex
+from utils.library_server import LibraryServer
+
+
+def write(root, rel_path, content=""):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def descriptor(name, remote_file_id, version="1.0", extra=""):
+    return f'version="{version}"\nname="{name}"\nsupported_version="1.11.*"\nremote_file_id="{remote_file_id}"\n{extra}'
+
+
+@pytest.fixture
+def index(tmp_path):
+    workshop = str(tmp_path / "workshop")
+    write(workshop, "1/descriptor.mod", descriptor("Travelers", "1"))
+    write(workshop, "2/descriptor.mod", descriptor("AGOT Compatibility", "2", extra='dependencies={\n"Travelers"\n}\n'))
+    for item in ("1", "2"):
+        write(workshop, f"{item}/common/traits/00_traits.txt", "trait = {}")
+        write(workshop, f"{item}/README.md", "readme")
+
+    processor = ModProcessor({
+        "workshop_path": workshop,
+        "local_mods_path": str(tmp_path / "mod_local"),
+        "output_path": "out"
+    })
+    processor.initialize()
+    index = LibraryIndex(processor)
+    index.build()
+    yield index
+    processor.catalog.close()
+
+
+def get_json(index, path):
+    return json.loads(index.get(path))
+
+
+def test_get_serves_library_queries(index):
+    assert [mod["name"] for mod in get_json(index, "/mods")] == ["Travelers", "AGOT Compatibility"]
+    assert get_json(index, "/mods/2")["dependencies"] == ["Travelers"]
+    assert get_json(index, "/dependencies")["Travelers"]["required_by"] == ["AGOT Compatibility"]
+    assert get_json(index, "/issues") == []
+    # README.md is in both mods, but the game never loads it
+    assert get_json(index, "/conflicts") == {"common/traits/00_traits.txt": ["Travelers", "AGOT Compatibility"]}
+    assert get_json(index, "/")["mods"] == 2
+    assert index.get("/mods/3") is None
+
+
+def test_index_is_rebuilt_after_changes(index):
+    workshop = index.processor.config["workshop_path"]
+    assert not index.is_stale()
+
+    # Steam rewrites the descriptor of an updated item in place
+    mod_file = os.path.join(workshop, "1", "descriptor.mod")
+    stat = os.stat(mod_file)
+    write(workshop, "1/descriptor.mod", descriptor("Travelers", "1", version="1.1"))
+    os.utime(mod_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert index.is_stale()
+    index.build()
+    assert get_json(index, "/mods/1")["mod_version"] == "mv1.1"
+    assert not index.is_stale()
+
+    write(workshop, "3/descriptor.mod", descriptor("New Mod", "3"))
+    assert index.is_stale()
+    index.build()
+    assert get_json(index, "/mods/3")["name"] == "New Mod"
+
+
+async def request(port, request_line):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"{request_line}\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), body
+
+
+def test_server_answers_requests(index):
+    async def run():
+        server = LibraryServer(index)
+        tcp_server = await asyncio.start_server(server.handle_request, '127.0.0.1', 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+        async with tcp_server:
+            return [
+                await request(port, "GET /mods/1?pretty HTTP/1.1"),
+                await request(port, "HEAD /mods HTTP/1.1"),
+                await request(port, "GET /unknown HTTP/1.1"),
+                await request(port, "POST /mods HTTP/1.1"),
+                await request(port, "GET")
+            ]
+
+    ok, head, not_found, not_allowed, malformed = asyncio.run(run())
+
+    assert ok[0] == 200 and json.loads(ok[1])["name"] == "Travelers"
+    assert head == (200, b'')
+    assert not_found[0] == 404 and json.loads(not_found[1]) == {"error": "Unknown endpoint: /unknown"}
+    assert not_allowed[0] == 405
+    assert malformed[0] == 400
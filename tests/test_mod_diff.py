@@ -0,0 +1,44 @@
+import os
+import shutil
+
+import pytest
+
+from utils.mod_diff import ModDiff
+
+
+def write(root, rel_path, content):
+    path = os.path.join(root, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def test_compare_lists_file_and_object_changes(tmp_path):
+    old = str(tmp_path / "old")
+    write(old, "descriptor.mod", 'name="Travelers"')
+    write(old, "common/rules.txt", "rule_a = { x = 1 }\nrule_b = yes\n")
+    write(old, "localization/english/t_l_english.yml", 'l_english:\n key_a:0 "A"\n key_b:0 "B"\n')
+    write(old, "gone.txt", "")
+    new = str(tmp_path / "new")
+    shutil.copytree(old, new)
+    os.unlink(os.path.join(new, "gone.txt"))
+    write(new, "added.txt", "")
+    write(new, "common/rules.txt", "rule_a = {\n    x = 2\n}\nrule_c = yes\n")
+    write(new, "localization/english/t_l_english.yml", 'l_english:\n key_a:0 "A2"\n key_b:0 "B"\n')
+
+    diff = ModDiff.compare(old, new)
+
+    assert diff["added"] == ["added.txt"]
+    assert diff["removed"] == ["gone.txt"]
+    assert diff["modified"] == ["common/rules.txt", "localization/english/t_l_english.yml"]
+    assert diff["unchanged"] == 1
+    assert diff["structural"]["common/rules.txt"] == {"added": ["rule_c"], "removed": ["rule_b"], "changed": ["rule_a"]}
+    assert diff["structural"]["localization/english/t_l_english.yml"]["changed"] == ["key_a"]
+
+
+def test_compare_rejects_files(tmp_path):
+    write(str(tmp_path), "travelers.mod", 'name="Travelers"')
+    os.makedirs(tmp_path / "out")
+
+    with pytest.raises(NotADirectoryError):
+        ModDiff.compare(str(tmp_path / "out"), str(tmp_path / "travelers.mod"))
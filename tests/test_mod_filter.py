@@ -0,0 +1,39 @@
+from utils.mod_filter import ModFilter
+
+
+def matches(mod_filter, metadata, game_version="1.11.0"):
+    return mod_filter.matches(metadata, game_version)
+
+
+def test_compatible_matches_wildcard_supported_version():
+    mod_filter = ModFilter(compatible_only=True)
+
+    assert matches(mod_filter, {"name": "Travelers", "workshop_id": "1", "game_version": "gv1.11.*"})
+    assert matches(mod_filter, {"name": "Travelers", "workshop_id": "1", "game_version": "gv1.11.0"})
+    assert not matches(mod_filter, {"name": "Travelers", "workshop_id": "1", "game_version": "gv1.14.*"})
+    assert not matches(mod_filter, {"name": "Travelers", "workshop_id": "1"})
+
+
+def test_name_id_and_tag_filters():
+    metadata = {"name": "Travelers", "workshop_id": "3082182371", "tags": ['"Gameplay"', '"Events"']}
+
+    assert matches(ModFilter(name_patterns=["trav*"]), metadata)
+    assert not matches(ModFilter(name_patterns=["agot*"]), metadata)
+    assert matches(ModFilter(remote_file_ids=["3082182371"]), metadata)
+    assert matches(ModFilter(tags=["events"]), metadata)
+    assert not matches(ModFilter(tags=["map"]), metadata)
+
+
+def test_playset_selects_enabled_mods_by_id_or_name(tmp_path):
+    playset = tmp_path / "playset.json"
+    playset.write_text(
+        '{"name": "P", "mods": ['
+        '{"displayName": "Travelers", "steamId": "1", "enabled": true},'
+        '{"displayName": "Disabled", "steamId": "2", "enabled": false},'
+        '{"displayName": "Local Mod", "enabled": true}]}'
+    )
+    mod_filter = ModFilter(playset_path=str(playset))
+
+    assert matches(mod_filter, {"name": "Travelers", "workshop_id": "1"})
+    assert not matches(mod_filter, {"name": "Disabled", "workshop_id": "2"})
+    assert matches(mod_filter, {"name": "Local Mod", "workshop_id": "99"})
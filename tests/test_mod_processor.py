@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from index import ModProcessor, diff_main
+from utils.logger import logger
+
+
+def write_descriptor(folder, name, remote_file_id, extra=""):
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, "descriptor.mod"), 'w', encoding='utf-8') as f:
+        f.write(f'version="1.0"\nname="{name}"\nsupported_version="1.11.*"\nremote_file_id="{remote_file_id}"\n{extra}')
+
+
+@pytest.fixture
+def processor(tmp_path):
+    workshop = tmp_path / "workshop"
+    write_descriptor(str(workshop / "1"), "Travelers", "1")
+    processor = ModProcessor({
+        "workshop_path": str(workshop),
+        "local_mods_path": str(tmp_path / "mod_local"),
+        "output_path": "out"
+    })
+    yield processor
+    processor.catalog.close()
+
+
+def test_present_dependency_is_not_reported(processor):
+    workshop = processor.config["workshop_path"]
+    write_descriptor(os.path.join(workshop, "2"), "Travelers AGOT Compatibility", "2", 'dependencies={\n"Travelers"\n}\n')
+    processor.refresh_catalog()
+
+    assert processor.process_single_mod_file("2/descriptor.mod", workshop, False)
+    assert processor.mod_report.issues == []
+
+
+def test_missing_dependency_is_reported(processor):
+    workshop = processor.config["workshop_path"]
+    write_descriptor(os.path.join(workshop, "2"), "Travelers AGOT Compatibility", "2", 'dependencies={\n"AGOT"\n}\n')
+    processor.refresh_catalog()
+
+    assert processor.process_single_mod_file("2/descriptor.mod", workshop, False)
+    assert processor.mod_report.issues[0]["missing_dependencies"] == ['"AGOT"']
+
+
+def test_find_mod_falls_back_to_copy_of_previous_version(processor):
+    output = processor.output_path
+    os.makedirs(output / "Travelers [gv1.11.*][mv0.9]")
+    os.makedirs(output / "Travelers [gv1.11.*][mv0.8] [LOCAL]")
+    os.makedirs(output / "Travelers AGOT Compatibility [gv1.11.*][mv1.0]")
+
+    source_path, dest_path = processor.find_mod("Travelers")
+
+    assert source_path.name == "1"
+    assert dest_path == output / "Travelers [gv1.11.*][mv0.9]"
+
+    os.makedirs(output / "Travelers [gv1.11.*][mv1.0]")
+    assert processor.find_mod("1")[1] == output / "Travelers [gv1.11.*][mv1.0]"
+
+
+def test_diff_prints_only_the_report(processor, work_dir, capsys, monkeypatch):
+    monkeypatch.setattr(logger, "console", True)
+    with open(work_dir / "config.json", 'w') as f:
+        json.dump(processor.config, f)
+    write_descriptor(str(processor.output_path / "Travelers [gv1.11.*][mv1.0]"), "Travelers", "1")
+
+    diff_main(["Travelers"])
+
+    output = capsys.readouterr().out
+    assert output.startswith("Comparing ")
+    assert "0 added, 0 removed, 0 modified, 1 unchanged" in output
@@ -0,0 +1,129 @@
+import os
+
+from utils.file_operations import FileOperations
+from utils.run_journal import RunJournal
+
+
+def interrupted_run(output_dir):
+    """Leave behind the journal of a run that crashed while copying mod B"""
+    journal = RunJournal(str(output_dir))
+    journal.start(resume=False)
+    journal.mod_started("A", "/src/A")
+    journal.file_done("A", "descriptor.mod")
+    journal.mod_done("A")
+    journal.mod_started("B", "/src/B")
+    journal.file_done("B", "descriptor.mod")
+    journal.file_done("B", "common/file.txt")
+    journal.close()
+    return journal
+
+
+def test_load_replays_completed_and_in_flight_mods(tmp_path):
+    interrupted_run(tmp_path)
+    # A crash can leave a half written record at the end
+    with open(os.path.join(tmp_path, RunJournal.JOURNAL_NAME), 'a') as f:
+        f.write('{"event": "file_do')
+
+    journal = RunJournal(str(tmp_path))
+    journal.load()
+
+    assert journal.completed_mods == {"A"}
+    assert journal.done_files("B") == {"descriptor.mod", "common/file.txt"}
+    assert journal.done_files("A") == set()
+    assert not journal.previous_run_finished
+
+
+def test_finished_run_is_recorded(tmp_path):
+    journal = RunJournal(str(tmp_path))
+    journal.start(resume=False)
+    journal.finish()
+
+    journal = RunJournal(str(tmp_path))
+    journal.load()
+    assert journal.previous_run_finished
+
+
+def test_resume_keeps_progress_and_staging(tmp_path):
+    interrupted = interrupted_run(tmp_path)
+    os.makedirs(interrupted.staging_path("B"))
+
+    journal = RunJournal(str(tmp_path))
+    journal.start(resume=True)
+    journal.close()
+
+    assert journal.completed_mods == {"A"}
+    assert journal.done_files("B") == {"descriptor.mod", "common/file.txt"}
+    assert os.path.isdir(journal.staging_path("B"))
+
+
+def test_fresh_start_discards_progress_and_staging(tmp_path):
+    interrupted = interrupted_run(tmp_path)
+    os.makedirs(interrupted.staging_path("B"))
+
+    journal = RunJournal(str(tmp_path))
+    journal.start(resume=False)
+    journal.close()
+
+    assert journal.completed_mods == set()
+    assert journal.done_files("B") == set()
+    assert not os.path.exists(journal.staging_path("B"))
+
+    journal.load()
+    assert journal.completed_mods == set()
+
+
+def test_restarted_mod_is_no_longer_completed(tmp_path):
+    interrupted_run(tmp_path)
+    journal = RunJournal(str(tmp_path))
+    journal.start(resume=True)
+    # The output of A was deleted, so it is copied again
+    journal.mod_started("A", "/src/A")
+    journal.close()
+
+    journal.load()
+    assert "A" not in journal.completed_mods
+    assert journal.done_files("A") == set()
+
+
+def make_source(root):
+    os.makedirs(os.path.join(root, "common"))
+    for rel_path in ("descriptor.mod", "common/file.txt"):
+        with open(os.path.join(root, rel_path), 'w') as f:
+            f.write(rel_path)
+
+
+def test_copy_dir_staged_fails_for_missing_or_file_source(tmp_path):
+    source_file = tmp_path / "travelers.mod"
+    source_file.write_text('name="Travelers"')
+
+    assert not FileOperations.copy_dir_staged(str(tmp_path / "missing"), str(tmp_path / "dest"))
+    assert not FileOperations.copy_dir_staged(str(source_file), str(tmp_path / "dest"))
+
+
+def test_copy_dir_staged_reports_files_and_skips_done_ones(tmp_path):
+    src = str(tmp_path / "src")
+    dest = str(tmp_path / "dest")
+    make_source(src)
+
+    copied = []
+    assert FileOperations.copy_dir_staged(src, dest, set(), copied.append)
+    assert sorted(copied) == ["common/file.txt", "descriptor.mod"]
+    assert FileOperations.same_stat(os.path.join(src, "common/file.txt"), os.path.join(dest, "common/file.txt"))
+
+    # A done file whose staged copy no longer matches the source is copied again
+    with open(os.path.join(dest, "descriptor.mod"), 'w') as f:
+        f.write("truncated")
+    copied = []
+    assert FileOperations.copy_dir_staged(src, dest, {"descriptor.mod", "common/file.txt"}, copied.append)
+    assert copied == ["descriptor.mod"]
+
+
+def test_cleanup_keeps_hidden_state(tmp_path):
+    output = tmp_path / "out"
+    for name in (".ck3-workshop", "Old Mod"):
+        os.makedirs(output / name)
+        os.utime(output / name, (0, 0))
+
+    FileOperations.cleanup(str(output), 30)
+
+    assert sorted(os.listdir(output)) == [".ck3-workshop"]